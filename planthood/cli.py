@@ -5,20 +5,24 @@ python -m planthood.cli enrich           # extracted -> parsed   (LLM; --provide
 python -m planthood.cli schedule         # parsed  -> scheduled
 python -m planthood.cli build-data       # extract + enrich + schedule
 python -m planthood.cli quality          # print the quality scorecard (exit 1 on fail)
-python -m planthood.cli inspect <id>     # run one recipe through every stage and show it
+python -m planthood.cli inspect <id>...  # run recipes through every stage and show them
 """
 
 from __future__ import annotations
 
 import argparse
 import sys
+from itertools import islice
+from operator import attrgetter
+
+from pydantic import ValidationError
 
 from . import io
-from .enrich import enrich_all, enrich_recipe
+from .enrich import already_enriched, enrich_all, enrich_recipe
 from .extract import extract_all, extract_recipe
 from .llm import get_provider
 from .models import ExtractedRecipe, ParsedRecipe, RawRecipe, ScheduledRecipe
-from .quality import compute_report, format_report
+from .quality import check_thresholds, compute_report, format_report
 from .schedule import schedule_all, schedule_recipe
 
 
@@ -30,43 +34,74 @@ def _load(path, model, label):
     return recipes
 
 
-def cmd_extract(_args) -> None:
-    raws = _load(io.RAW_PATH, RawRecipe, "raw recipes")
+def _run_extract(raws):
     extracted = extract_all(raws)
     io.dump_recipes(io.EXTRACTED_PATH, extracted)  # deterministic: full rebuild
-    cookable = sum(1 for e in extracted if e.cookable)
-    with_steps = sum(1 for e in extracted if e.steps)
+    cookable = with_steps = 0
+    for e in extracted:  # one pass for both counts
+        cookable += e.cookable
+        with_steps += bool(e.steps)
     print(f"Extracted {len(extracted)} recipes: {cookable} cookable, {with_steps} with steps")
     print(f"Saved to {io.EXTRACTED_PATH}")
+    return extracted
 
 
-def cmd_enrich(args) -> None:
-    extracted = _load(io.EXTRACTED_PATH, ExtractedRecipe, "extracted recipes")
+def _run_enrich(extracted, args):
     provider = get_provider(args.provider)
+    checkpoint = io.PARSED_CHECKPOINT_PATH
     # Resume from prior results: recipes already LLM-enriched (for their current text) are
-    # reused, so a daily run only spends quota on the backlog. --fresh ignores prior results.
-    existing = None if args.fresh else io.load_recipes(io.PARSED_PATH, ParsedRecipe)
+    # reused, so a daily run only spends quota on the backlog. That includes results an
+    # interrupted run checkpointed (later lines win). --fresh ignores prior results.
+    if args.fresh:
+        checkpoint.unlink(missing_ok=True)
+        existing = None
+    else:
+        existing = io.load_recipes(io.PARSED_PATH, ParsedRecipe)
+        existing += io.load_jsonl(checkpoint, ParsedRecipe)
     print(f"Enriching with provider: {provider.name} (limit={args.limit or 'none'})")
-    parsed = enrich_all(extracted, provider=provider, existing=existing, limit=args.limit)
+    parsed = enrich_all(
+        extracted,
+        provider=provider,
+        existing=existing,
+        limit=args.limit,
+        concurrency=args.concurrency,
+        on_enriched=lambda r: io.append_jsonl(checkpoint, r),
+    )
     io.dump_recipes(io.PARSED_PATH, parsed)  # parsed is the complete, resume-aware set
+    checkpoint.unlink(missing_ok=True)  # folded into PARSED_PATH
     print(f"Enriched {len(parsed)} recipes; {sum(1 for r in parsed if r.steps)} have steps")
     print(f"Saved to {io.PARSED_PATH}")
+    return parsed
 
 
-def cmd_schedule(_args) -> None:
-    parsed = _load(io.PARSED_PATH, ParsedRecipe, "parsed recipes")
-    scheduled = schedule_all(parsed)
+def _run_schedule(parsed, args):
+    scheduled = schedule_all(parsed, workers=args.workers)
     io.dump_recipes(io.SCHEDULED_PATH, scheduled)  # deterministic from parsed
     with_steps = [r for r in scheduled if r.steps]
     avg = sum(r.total_time_min for r in with_steps) / len(with_steps) if with_steps else 0
     print(f"Scheduled {len(scheduled)} recipes; avg cook time {avg:.0f} min")
     print(f"Saved to {io.SCHEDULED_PATH}")
+    return scheduled
+
+
+def cmd_extract(_args) -> None:
+    _run_extract(_load(io.RAW_PATH, RawRecipe, "raw recipes"))
+
+
+def cmd_enrich(args) -> None:
+    _run_enrich(_load(io.EXTRACTED_PATH, ExtractedRecipe, "extracted recipes"), args)
+
+
+def cmd_schedule(args) -> None:
+    _run_schedule(_load(io.PARSED_PATH, ParsedRecipe, "parsed recipes"), args)
 
 
 def cmd_build_data(args) -> None:
-    cmd_extract(args)
-    cmd_enrich(args)
-    cmd_schedule(args)
+    # Each stage hands its in-memory result to the next; the artifacts are still written,
+    # but never read back and re-validated within the same run.
+    extracted = _run_extract(_load(io.RAW_PATH, RawRecipe, "raw recipes"))
+    parsed = _run_enrich(extracted, args)
+    _run_schedule(parsed, args)
 
 
 def cmd_quality(_args) -> None:
@@ -78,42 +113,59 @@ def cmd_quality(_args) -> None:
         sys.exit(1)
     report = compute_report(extracted, scheduled, raws)
     print(format_report(report))
-    from .quality import check_thresholds
-
     passed, _ = check_thresholds(report)
     sys.exit(0 if passed else 1)
 
 
-def cmd_inspect(args) -> None:
-    """Run a single recipe through every stage and print the result."""
-    raws = {r.id: r for r in io.load_recipes(io.RAW_PATH, RawRecipe)}
-    raw = raws.get(args.recipe)
-    if raw is None:
-        matches = [rid for rid in raws if args.recipe.lower() in rid.lower()]
-        if len(matches) == 1:
-            raw = raws[matches[0]]
-        else:
-            print(
-                f"Recipe '{args.recipe}' not found."
-                + (f" Did you mean: {matches[:5]}" if matches else "")
-            )
-            sys.exit(1)
+def _resolve_id(query: str, ids) -> str:
+    """An exact id, or the single id containing ``query``; exits with hints otherwise."""
+    if query in ids:
+        return query
+    needle = query.lower()
+    # Only up to five suggestions are ever shown (and one means unique), so stop there.
+    matches = list(islice((r for r in ids if needle in r.lower()), 5))
+    if len(matches) == 1:
+        return matches[0]
+    print(f"Recipe '{query}' not found." + (f" Did you mean: {matches}" if matches else ""))
+    sys.exit(1)
+
 
+def _inspect_one(raw: RawRecipe, saved, provider) -> None:
     extracted = extract_recipe(raw)
-    provider = get_provider(args.provider)
-    parsed = enrich_recipe(extracted, provider=provider)
-    scheduled = schedule_recipe(parsed)
+    # Reuse the saved LLM enrichment when it was made for this recipe's current text, so
+    # re-inspecting costs no LLM call (or API key).
+    prior = None
+    if saved:
+        try:
+            prior = ParsedRecipe.model_validate(saved)
+        except ValidationError as e:  # stale/corrupt record: ignore it, as load_recipes would
+            print(
+                f"Warning: ignoring invalid saved ParsedRecipe '{raw.id}': "
+                f"{e.error_count()} error(s)"
+            )
+    if already_enriched(prior, extracted):
+        parsed, source = prior, f"saved {io.PARSED_PATH.name}"
+    elif not (extracted.cookable and extracted.steps):
+        parsed, source = enrich_recipe(extracted, allow_llm=False), "none"  # nothing to enrich
+    else:
+        llm = provider()
+        parsed, source = enrich_recipe(extracted, provider=llm), llm.name
 
     print(f"\n{raw.title}\n{'=' * len(raw.title)}")
     print(
         f"id={raw.id}  cookable={extracted.cookable}  method={extracted.extraction_method}  "
-        f"provider={provider.name}"
+        f"provider={source}"
     )
+    if not parsed.steps:
+        print("No steps extracted; nothing to schedule.")
+        return
+    scheduled = schedule_recipe(parsed)
     print(
         f"total={scheduled.total_time_min}min  active={scheduled.active_time_min}min  "
         f"steps={len(scheduled.steps)}\n"
     )
-    for s in sorted(scheduled.steps, key=lambda x: x.start_min):
+    # Steps keep input order (not topological); a stable sort by start gives timeline order.
+    for s in sorted(scheduled.steps, key=attrgetter("start_min")):
         crit = " *critical*" if s.is_critical else f" slack={s.slack_min}"
         temp = f" {s.temperature_c}C" if s.temperature_c else ""
         print(
@@ -123,6 +175,34 @@ def cmd_inspect(args) -> None:
         print(f"        └ {s.raw_text[:90]}")
 
 
+def cmd_inspect(args) -> None:
+    """Run one or more recipes through every stage and print the results."""
+    # Both artifacts are indexed by id once, unvalidated; only the inspected records are
+    # built into models. Every id is resolved before any LLM work starts.
+    raws = io.index_records(io.RAW_PATH)
+    # Saved results don't record which model made them, so an explicit --provider (like
+    # --fresh) always enriches anew rather than showing another model's output.
+    reuse_saved = not args.fresh and args.provider is None
+    saved = io.index_records(io.PARSED_PATH) if reuse_saved else {}
+    rids = [_resolve_id(q, raws) for q in args.recipes]
+    llm = None
+
+    def provider():
+        """The LLM provider, built on first need and then shared by every recipe."""
+        nonlocal llm
+        if llm is None:
+            llm = get_provider(args.provider)
+        return llm
+
+    for rid in dict.fromkeys(rids):
+        try:
+            raw = RawRecipe.model_validate(raws[rid])
+        except ValidationError as e:  # what load_recipes would have skipped
+            print(f"Warning: skipping invalid RawRecipe '{rid}': {e.error_count()} error(s)")
+            continue
+        _inspect_one(raw, saved.get(rid), provider)
+
+
 def main(argv=None) -> None:
     parser = argparse.ArgumentParser(prog="planthood", description="Recipe pipeline CLI")
     sub = parser.add_subparsers(dest="command", required=True)
@@ -145,6 +225,20 @@ def main(argv=None) -> None:
         p.add_argument(
             "--fresh", action="store_true", help="ignore prior results and re-enrich from scratch"
         )
+        p.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="LLM calls in flight at once (default 1; still paced by ENRICH_MIN_INTERVAL_SEC)",
+        )
+
+    def add_schedule_opts(p):
+        p.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="processes to schedule recipes across (default 1; worth it for big corpora)",
+        )
 
     p_ex = sub.add_parser("extract", help="raw -> extracted (deterministic)")
     p_ex.set_defaults(func=cmd_extract)
@@ -154,18 +248,25 @@ def main(argv=None) -> None:
     p_en.set_defaults(func=cmd_enrich)
 
     p_sc = sub.add_parser("schedule", help="parsed -> scheduled")
+    add_schedule_opts(p_sc)
     p_sc.set_defaults(func=cmd_schedule)
 
     p_bd = sub.add_parser("build-data", help="extract + enrich + schedule")
     add_enrich_opts(p_bd)
+    add_schedule_opts(p_bd)
     p_bd.set_defaults(func=cmd_build_data)
 
     p_q = sub.add_parser("quality", help="print the quality scorecard")
     p_q.set_defaults(func=cmd_quality)
 
-    p_in = sub.add_parser("inspect", help="run one recipe through every stage")
-    p_in.add_argument("recipe", help="recipe id (or unique substring)")
+    p_in = sub.add_parser("inspect", help="run recipes through every stage")
+    p_in.add_argument("recipes", nargs="+", help="recipe ids (or unique substrings)")
     add_provider(p_in)
+    p_in.add_argument(
+        "--fresh",
+        action="store_true",
+        help="re-enrich even if a saved LLM result is current (implied by --provider)",
+    )
     p_in.set_defaults(func=cmd_inspect)
 
     args = parser.parse_args(argv)
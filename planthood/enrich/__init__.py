@@ -5,6 +5,6 @@ returns one enrichment object per fixed id and can neither invent nor drop steps
 heuristically split ("paragraph") recipes the LLM may re-segment.
 """
 
-from .enricher import ENRICH_SCHEMA, enrich_all, enrich_recipe
+from .enricher import ENRICH_SCHEMA, already_enriched, enrich_all, enrich_recipe
 
-__all__ = ["enrich_recipe", "enrich_all", "ENRICH_SCHEMA"]
+__all__ = ["enrich_recipe", "enrich_all", "already_enriched", "ENRICH_SCHEMA"]
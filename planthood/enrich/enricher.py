@@ -4,8 +4,11 @@ from __future__ import annotations
 
 import json
 import os
+import random
+import threading
 import time
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
 
 from ..io import content_hash
 from ..llm import STEPS_MARKER, LLMProvider, get_provider, mock_enrich_steps
@@ -102,7 +105,7 @@ def _coerce_step(raw: dict, *, step_id: str, raw_text: str) -> RecipeStep:
         temp = _infer_temp(raw_text)
 
     if "equipment" in raw:
-        equipment = [e for e in raw.get("equipment") or [] if isinstance(e, str)]
+        equipment = [e for e in raw.get("equipment") or () if isinstance(e, str)]
     else:
         equipment = _infer_equipment(raw_text)
 
@@ -114,8 +117,9 @@ def _coerce_step(raw: dict, *, step_id: str, raw_text: str) -> RecipeStep:
         estimated_duration_minutes=dur,
         equipment=equipment,
         temperature_c=temp,
-        requires=[r for r in raw.get("requires", []) if isinstance(r, str)],
-        can_overlap_with=[c for c in raw.get("can_overlap_with", []) if isinstance(c, str)],
+        # `or ()` also covers an explicit null from the model.
+        requires=[r for r in raw.get("requires") or () if isinstance(r, str)],
+        can_overlap_with=[c for c in raw.get("can_overlap_with") or () if isinstance(c, str)],
         notes=(raw.get("notes") or "").strip(),
     )
 
@@ -130,8 +134,6 @@ def _sanitize_graph(steps: List[RecipeStep]) -> List[RecipeStep]:
 
 
 def _build_steps(recipe: ExtractedRecipe, enriched: List[dict]) -> List[RecipeStep]:
-    by_id: Dict[str, dict] = {e["id"]: e for e in enriched if isinstance(e, dict) and "id" in e}
-
     if recipe.needs_llm_segmentation:
         # Trust the model's (re)segmentation; renumber ids sequentially for stability.
         steps: List[RecipeStep] = []
@@ -143,6 +145,7 @@ def _build_steps(recipe: ExtractedRecipe, enriched: List[dict]) -> List[RecipeSt
         return _sanitize_graph(steps)
 
     # Marker case: extractor ids/texts are authoritative — one step out per step in.
+    by_id: Dict[str, dict] = {e["id"]: e for e in enriched if isinstance(e, dict) and "id" in e}
     steps = [_coerce_step(by_id.get(s.id, {}), step_id=s.id, raw_text=s.text) for s in recipe.steps]
     return _sanitize_graph(steps)
 
@@ -174,8 +177,9 @@ def _complete_with_retry(provider: LLMProvider, system: str, user: str) -> objec
             if _is_daily_quota_exhausted(e):
                 break  # daily quota gone; retrying is futile — fall through to raise
             if attempt < LLM_RETRIES - 1:
-                # Backoff long enough to clear a per-minute rate-limit window (up to ~30s).
-                time.sleep(min(30, 8 * (attempt + 1)))
+                # Backoff long enough to clear a per-minute rate-limit window (up to ~30s),
+                # jittered so concurrent workers that failed together don't retry in lockstep.
+                time.sleep(min(30, 8 * (attempt + 1)) + random.uniform(0, 2))
     raise last if last else RuntimeError("enrichment failed")
 
 
@@ -294,7 +298,7 @@ def enrich_recipe(
     )
 
 
-def _already_enriched(existing: Optional[ParsedRecipe], recipe: ExtractedRecipe) -> bool:
+def already_enriched(existing: Optional[ParsedRecipe], recipe: ExtractedRecipe) -> bool:
     """True if a prior run already produced genuine LLM steps for this recipe's current text."""
     return bool(
         existing and existing.provenance == "llm" and existing.source_hash == source_hash(recipe)
@@ -306,6 +310,8 @@ def enrich_all(
     provider: Optional[LLMProvider] = None,
     existing: Optional[List[ParsedRecipe]] = None,
     limit: int = 0,
+    concurrency: int = 1,
+    on_enriched: Optional[Callable[[ParsedRecipe], None]] = None,
 ) -> List[ParsedRecipe]:
     """Enrich recipes, resuming from prior results — no separate cache.
 
@@ -314,38 +320,63 @@ def enrich_all(
     (``limit=0`` means no cap — enrich until the quota-driven circuit breaker trips). This
     is the "complete X recipes per day" mechanism: point daily CI at the committed
     ``recipes_parsed.json`` and it works through the backlog, ``limit`` new recipes at a time.
+
+    With ``concurrency > 1`` up to that many LLM calls are in flight at once (threads; the
+    provider SDKs block on network I/O). The limit, call pacing and circuit breaker are
+    shared across threads, and results keep input order.
+
+    ``on_enriched`` is called (one call at a time) with each recipe the LLM enriched this
+    run, as soon as it is done — a hook for checkpointing paid-for work before the batch
+    finishes.
     """
     provider = provider or get_provider()
     existing_by_id: Dict[str, ParsedRecipe] = {r.id: r for r in (existing or [])}
     breaker = _Breaker()
+    lock = threading.Lock()  # guards breaker, spent and last_llm_ts across worker threads
     spent = 0
     last_llm_ts = 0.0
-    out: List[ParsedRecipe] = []
 
-    for r in recipes:
+    def record(success: bool) -> None:
+        with lock:
+            breaker.record(success)
+
+    def enrich_one(r: ExtractedRecipe) -> ParsedRecipe:
+        nonlocal spent, last_llm_ts
         prior = existing_by_id.get(r.id)
-        if _already_enriched(prior, r):
-            out.append(prior)  # done on a previous run; don't spend quota again
-            continue
-
-        budget_left = limit == 0 or spent < limit
-        allow_llm = r.cookable and bool(r.steps) and budget_left and not breaker.tripped
-        if allow_llm:
-            # Pace calls to stay under the provider's requests-per-minute limit
-            # (e.g. Gemini free tier ~5 RPM). This is what makes the daily run slowly
-            # but reliably clear the backlog instead of tripping on 429s.
-            wait = MIN_LLM_INTERVAL_SEC - (time.time() - last_llm_ts)
-            if wait > 0:
-                time.sleep(wait)
-            spent += 1
-            last_llm_ts = time.time()
+        if already_enriched(prior, r):
+            return prior  # done on a previous run; don't spend quota again
+
+        with lock:
+            budget_left = limit == 0 or spent < limit
+            allow_llm = r.cookable and bool(r.steps) and budget_left and not breaker.tripped
+            if allow_llm:
+                # Pace calls to stay under the provider's requests-per-minute limit
+                # (e.g. Gemini free tier ~5 RPM). This is what makes the daily run slowly
+                # but reliably clear the backlog instead of tripping on 429s. Sleeping
+                # under the lock keeps the spacing between call starts across threads.
+                wait = MIN_LLM_INTERVAL_SEC - (time.time() - last_llm_ts)
+                if wait > 0:
+                    time.sleep(wait)
+                spent += 1
+                last_llm_ts = time.time()
         try:
-            out.append(
-                enrich_recipe(r, provider=provider, allow_llm=allow_llm, on_llm=breaker.record)
-            )
+            result = enrich_recipe(r, provider=provider, allow_llm=allow_llm, on_llm=record)
         except Exception as e:  # one bad recipe must not abort the batch
             print(f"Enrich error for {r.id}: {e}")
-            out.append(_fallback_recipe(r))
+            return _fallback_recipe(r)
+        if on_enriched and result.provenance == "llm":
+            with lock:
+                try:
+                    on_enriched(result)
+                except Exception as e:  # a failed checkpoint must not lose the batch's results
+                    print(f"Checkpoint error for {r.id}: {e}")
+        return result
+
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            out = list(pool.map(enrich_one, recipes))
+    else:
+        out = [enrich_one(r) for r in recipes]
 
     llm_total = sum(1 for r in out if r.provenance == "llm")
     remaining = sum(1 for r in out if r.provenance == "fallback")
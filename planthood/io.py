@@ -9,11 +9,13 @@ already has content with one that has none.
 from __future__ import annotations
 
 import hashlib
-import json
+import os
+import tempfile
 from pathlib import Path
 from typing import Callable, Dict, List, Optional, Sequence, Type, TypeVar
 
 from pydantic import BaseModel, ValidationError
+from pydantic_core import from_json, to_json
 
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 
@@ -22,6 +24,8 @@ RAW_PATH = DATA_DIR / "raw_recipes.json"
 EXTRACTED_PATH = DATA_DIR / "recipes_extracted.json"
 PARSED_PATH = DATA_DIR / "recipes_parsed.json"
 SCHEDULED_PATH = DATA_DIR / "recipes_with_schedule.json"
+# LLM results appended as they arrive during enrich; folded into PARSED_PATH at the end.
+PARSED_CHECKPOINT_PATH = DATA_DIR / "recipes_parsed.partial.jsonl"
 
 M = TypeVar("M", bound=BaseModel)
 
@@ -30,20 +34,52 @@ M = TypeVar("M", bound=BaseModel)
 # JSON primitives
 # --------------------------------------------------------------------------- #
 def read_json(path: Path):
-    """Load raw JSON, or return None if the file is missing."""
-    if not Path(path).exists():
+    """Load raw JSON (plain dicts and lists), or return None if the file is missing."""
+    path = Path(path)
+    if not path.exists():
         return None
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return from_json(path.read_bytes())
 
 
-def write_json(path: Path, obj) -> None:
-    """Write pretty JSON with a trailing newline (matches repo convention)."""
-    path = Path(path)
+def write_json(path: Path, obj) -> bool:
+    """Write pretty JSON with a trailing newline (matches repo convention).
+
+    Output is 2-space indented UTF-8, equivalent JSON to
+    ``json.dump(obj, indent=2, ensure_ascii=False)``. Returns False (and leaves the file
+    alone) when the content is unchanged.
+    """
+    return write_bytes_atomic(Path(path), to_json(obj, indent=2) + b"\n")
+
+
+def write_bytes_atomic(path: Path, data: bytes) -> bool:
+    """Replace ``path`` with ``data``; returns False (writing nothing) if unchanged.
+
+    The bytes go to a uniquely named temp file beside ``path``, are fsynced, and are then
+    moved into place with ``os.replace``: readers and concurrent writers never see a partial
+    file, and a crash or power loss leaves either the old content or the new.
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False)
-        f.write("\n")
+    try:
+        st = path.stat()
+        if st.st_size == len(data) and path.read_bytes() == data:
+            return False
+        mode = st.st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    tmp = tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+    )
+    try:
+        with tmp:
+            tmp.write(data)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.chmod(tmp.name, mode)  # temp files are created 0600
+        os.replace(tmp.name, path)
+    except BaseException:
+        Path(tmp.name).unlink(missing_ok=True)
+        raise
+    return True
 
 
 # --------------------------------------------------------------------------- #
@@ -71,9 +107,57 @@ def load_recipes(path: Path, model: Type[M]) -> List[M]:
     return out
 
 
+def index_records(path: Path) -> Dict[str, dict]:
+    """Map ``id`` -> raw JSON record for an artifact; no record is validated.
+
+    For single-recipe lookups: validate just the records you need with
+    ``model.model_validate``. Rows that are not objects with an ``id`` are left out.
+    """
+    data = read_json(path)
+    if data is None:
+        return {}
+    if not isinstance(data, list):
+        raise ValueError(f"{path} does not contain a JSON array")
+    return {item["id"]: item for item in data if isinstance(item, dict) and "id" in item}
+
+
 def dump_recipes(path: Path, recipes: Sequence[BaseModel]) -> None:
-    """Serialize a list of recipe models to JSON (json mode handles nested/optional)."""
-    write_json(path, [r.model_dump(mode="json") for r in recipes])
+    """Serialize a list of recipe models to JSON.
+
+    The models are encoded directly by pydantic, in the same layout as :func:`write_json`.
+    The file is replaced atomically, so an interrupted run never leaves a truncated artifact.
+    """
+    write_bytes_atomic(Path(path), to_json(list(recipes), indent=2) + b"\n")
+
+
+def append_jsonl(path: Path, record: BaseModel) -> None:
+    """Append one model as a JSON line, flushed to disk before returning, so a run that
+    is killed afterwards still has it."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "ab") as f:
+        f.write(to_json(record) + b"\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def load_jsonl(path: Path, model: Type[M]) -> List[M]:
+    """Load a JSON-lines file written by :func:`append_jsonl`.
+
+    Unparseable lines (e.g. one cut short by a crash mid-append) are skipped with a warning.
+    """
+    path = Path(path)
+    if not path.exists():
+        return []
+    out: List[M] = []
+    for n, line in enumerate(path.read_bytes().splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            out.append(model.model_validate_json(line))
+        except ValidationError as e:
+            print(f"Warning: skipping invalid line {n} of {path.name}: {e.error_count()} error(s)")
+    return out
 
 
 # --------------------------------------------------------------------------- #
@@ -145,7 +229,11 @@ def content_hash(*parts: str) -> str:
 
 
 class Cache:
-    """Minimal file cache: values are JSON, keyed by a content hash under ``cache_dir``."""
+    """Minimal file cache: values are JSON, keyed by a content hash under ``cache_dir``.
+
+    Entries are machine-read only and stored as compact JSON. Each write replaces the entry
+    atomically via :func:`write_bytes_atomic`, so threads may set the same key concurrently.
+    """
 
     def __init__(self, cache_dir: Path, enabled: bool = True):
         self.cache_dir = Path(cache_dir)
@@ -159,8 +247,8 @@ class Cache:
         f = self.cache_dir / f"{key}.json"
         if f.exists():
             try:
-                return json.loads(f.read_text(encoding="utf-8"))
-            except (json.JSONDecodeError, OSError) as e:
+                return from_json(f.read_bytes())
+            except (ValueError, OSError) as e:  # ValueError: malformed JSON
                 print(f"Cache read error for {key}: {e}")
         return None
 
@@ -169,6 +257,6 @@ class Cache:
             return
         f = self.cache_dir / f"{key}.json"
         try:
-            f.write_text(json.dumps(value, indent=2, ensure_ascii=False), encoding="utf-8")
+            write_bytes_atomic(f, to_json(value))
         except OSError as e:
             print(f"Cache write error for {key}: {e}")
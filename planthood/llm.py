@@ -25,6 +25,10 @@ load_dotenv()
 # Real models read it as context; the mock parses the JSON that follows it.
 STEPS_MARKER = "STEPS_JSON:"
 
+# Per-request timeout (seconds) for the real providers. The SDK defaults are ~10 minutes,
+# so one stalled call would hold up its batch slot; a timeout turns it into a retryable error.
+LLM_TIMEOUT_SEC = float(os.getenv("LLM_TIMEOUT_SEC", "120"))
+
 
 class LLMProvider(ABC):
     """Return a structured object matching ``schema`` for the given prompt."""
@@ -47,7 +51,7 @@ class AnthropicProvider(LLMProvider):
         if not key:
             raise ValueError("ANTHROPIC_API_KEY not set")
         self.model = model or os.getenv("ANTHROPIC_MODEL", "claude-haiku-4-5-20251001")
-        self.client = Anthropic(api_key=key)
+        self.client = Anthropic(api_key=key, timeout=LLM_TIMEOUT_SEC)
 
     def complete_json(self, system: str, user: str, schema: dict) -> object:
         resp = self.client.messages.create(
@@ -85,7 +89,7 @@ class OpenAIProvider(LLMProvider):
         if not key:
             raise ValueError("OPENAI_API_KEY not set")
         self.model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-        self.client = OpenAI(api_key=key)
+        self.client = OpenAI(api_key=key, timeout=LLM_TIMEOUT_SEC)
 
     def complete_json(self, system: str, user: str, schema: dict) -> object:
         resp = self.client.chat.completions.create(
@@ -117,7 +121,10 @@ class GeminiProvider(LLMProvider):
         if not key:
             raise ValueError("GEMINI_API_KEY not set")
         self.model_name = model or os.getenv("GEMINI_MODEL", "gemini-3.5-flash")
-        self.client = genai.Client(api_key=key)
+        self.client = genai.Client(
+            api_key=key,
+            http_options={"timeout": int(LLM_TIMEOUT_SEC * 1000)},  # milliseconds
+        )
 
     def complete_json(self, system: str, user: str, schema: dict) -> object:
         resp = self.client.models.generate_content(
@@ -21,20 +21,25 @@ def _norm(s: str) -> str:
     return normalize_whitespace(s).lower()
 
 
-def _has_cycle(steps) -> bool:
-    ids = {s.id for s in steps}
-    graph = {s.id: [d for d in s.requires if d in ids and d != s.id] for s in steps}
-    color = {sid: 0 for sid in ids}  # 0 white, 1 grey, 2 black
-
-    def visit(n: str) -> bool:
-        color[n] = 1
-        for m in graph[n]:
-            if color[m] == 1 or (color[m] == 0 and visit(m)):
-                return True
-        color[n] = 2
-        return False
-
-    return any(color[sid] == 0 and visit(sid) for sid in ids)
+def _has_cycle(graph: Dict[str, List[str]]) -> bool:
+    """``graph`` maps each step id to the (existing, non-self) ids it requires.
+
+    Kahn's algorithm: repeatedly peel off steps nothing depends on; anything left over
+    lies on or behind a cycle. Iterative, so a long chain can't hit the recursion limit.
+    """
+    indeg = dict.fromkeys(graph, 0)  # number of dependents
+    for deps in graph.values():
+        for d in deps:
+            indeg[d] += 1
+    ready = [sid for sid, n in indeg.items() if n == 0]
+    peeled = 0
+    while ready:
+        peeled += 1
+        for d in graph[ready.pop()]:
+            indeg[d] -= 1
+            if indeg[d] == 0:
+                ready.append(d)
+    return peeled < len(graph)
 
 
 def compute_report(
@@ -51,14 +56,16 @@ def compute_report(
     cook_with_steps = sum(1 for e in cookable if sched_by_id.get(e.id) and sched_by_id[e.id].steps)
     empty_rate = (n_cook - cook_with_steps) / n_cook if n_cook else 0.0
 
-    grounded = total_steps = 0
+    grounded = total_steps = with_steps = 0
     timeline_violations = invalid_dep = dep_order_violations = cycles = 0
 
     for s in scheduled:
+        with_steps += bool(s.steps)
         raw = raw_by_id.get(s.id)
         method = _norm(raw.method) if raw else ""
-        ids = {x.id for x in s.steps}
-        by_id = {x.id: x for x in s.steps}
+        by_id = {x.id: x for x in s.steps}  # also the id set for validating deps
+        # Valid deps per step, filled in by the scan below; fed to the cycle check.
+        graph: Dict[str, List[str]] = {sid: [] for sid in by_id}
         for st in s.steps:
             total_steps += 1
             if method and _norm(st.raw_text) and _norm(st.raw_text) in method:
@@ -66,11 +73,15 @@ def compute_report(
             if st.end_min != st.start_min + st.duration_min:
                 timeline_violations += 1
             for d in st.requires:
-                if d not in ids:
+                prior = by_id.get(d)
+                if prior is None:
                     invalid_dep += 1
-                elif st.start_min < by_id[d].end_min:
+                    continue
+                if st.start_min < prior.end_min:
                     dep_order_violations += 1
-        if _has_cycle(s.steps):
+                if d != st.id:
+                    graph[st.id].append(d)
+        if _has_cycle(graph):
             cycles += 1
 
     grounding = grounded / total_steps if total_steps else 1.0
@@ -78,7 +89,7 @@ def compute_report(
     return {
         "recipes_total": len(scheduled),
         "recipes_cookable": n_cook,
-        "recipes_with_steps": sum(1 for s in scheduled if s.steps),
+        "recipes_with_steps": with_steps,
         "cookable_empty_rate": round(empty_rate, 4),
         "grounding": round(grounding, 4),
         "total_steps": total_steps,
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
-from collections import defaultdict, deque
-from typing import Dict, List
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
 
 from ..models import ParsedRecipe, RecipeStep, ScheduledRecipe, ScheduledStep
 
@@ -30,23 +33,67 @@ PASSIVE_PHRASES = (
     "let it sit",
     "leave for",
 )
+# Matches any passive phrase in a single search.
+_PASSIVE_RE = re.compile("|".join(map(re.escape, PASSIVE_PHRASES)))
 
 
-def _topological_order(steps: List[RecipeStep]) -> List[str]:
+# A step's id and the ids it requires: all the scheduler's graph analysis depends on.
+_Shape = Tuple[Tuple[str, Tuple[str, ...]], ...]
+_Adjacency = Tuple[Tuple[int, ...], ...]
+_Graph = Tuple[Tuple[int, ...], _Adjacency, _Adjacency, bool]
+# A lone step (even one listing itself as a dependency) is trivially a one-step chain.
+_SINGLE_STEP: _Graph = ((0,), ((),), ((),), True)
+
+
+def _build_and_sort(steps: List[RecipeStep]) -> _Graph:
+    """Topologically sort ``steps`` and index their neighbours (see :func:`_sort_shape`).
+
+    The analysis only depends on ids and ``requires``, and many recipes share the same
+    dependency shape (every mock-enriched recipe is a ``step-1 -> step-2 -> ...`` chain),
+    so results are memoised on that shape.
+    """
+    return _sort_shape(tuple((s.id, tuple(s.requires)) for s in steps))
+
+
+@lru_cache(maxsize=512)
+def _sort_shape(shape: _Shape) -> _Graph:
     """Kahn's algorithm; any steps left over by a dependency cycle are appended in
-    input order so the schedule still covers every step."""
-    ids = [s.id for s in steps]
-    id_set = set(ids)
-    graph: Dict[str, List[str]] = defaultdict(list)
-    indeg: Dict[str, int] = {sid: 0 for sid in ids}
-
-    for s in steps:
-        for dep in s.requires:
-            if dep in id_set and dep != s.id:
-                graph[dep].append(s.id)
-                indeg[s.id] += 1
-
-    queue = deque([sid for sid in ids if indeg[sid] == 0])
+    input order so the schedule still covers every step.
+
+    Steps are numbered by their position in the topological order. Returns
+    ``(at, pred, succ, is_chain)``: ``at[k]`` is the position of the k-th input step,
+    ``pred[i]`` the positions of step ``i``'s prerequisites that come before it (a
+    cycle's back edges are dropped), and ``succ[i]`` the positions of its dependents.
+    ``is_chain`` is True when the steps form one unbranched dependency chain (every
+    step critical, so no backward pass is needed). Everything returned is immutable
+    because it is shared through the cache.
+    """
+    if not any(requires for _, requires in shape):  # no deps: input order is valid
+        pos: Dict[str, int] = {}
+        for sid, _ in shape:
+            pos.setdefault(sid, len(pos))
+        none = ((),) * len(pos)
+        return tuple(pos[sid] for sid, _ in shape), none, none, len(pos) == 1
+
+    # One pass seeds both maps; indeg doubles as the id set for validating deps.
+    graph: Dict[str, List[str]] = {}
+    indeg: Dict[str, int] = {}
+    for sid, _ in shape:
+        graph[sid] = []
+        indeg[sid] = 0
+
+    edges = 0
+    branched = False
+    for sid, requires in shape:
+        for dep in requires:
+            if dep in indeg and dep != sid:
+                graph[dep].append(sid)
+                indeg[sid] += 1
+                edges += 1
+                branched = branched or indeg[sid] > 1 or len(graph[dep]) > 1
+
+    n = len(indeg)
+    queue = deque(sid for sid, d in indeg.items() if d == 0)
     order: List[str] = []
     while queue:
         cur = queue.popleft()
@@ -56,21 +103,63 @@ def _topological_order(steps: List[RecipeStep]) -> List[str]:
             if indeg[nxt] == 0:
                 queue.append(nxt)
 
-    if len(order) < len(ids):  # cycle: append remaining in input order
+    # n nodes, n-1 edges, no fan-in/fan-out and no cycle => a single path.
+    is_chain = not branched and edges == n - 1 and len(order) == n
+    if len(order) < n:  # cycle: append remaining in input order
         seen = set(order)
-        order.extend(sid for sid in ids if sid not in seen)
-    return order
+        order.extend(sid for sid in graph if sid not in seen)
+
+    pos = {sid: i for i, sid in enumerate(order)}
+    requires_of = dict(shape)
+    pred = tuple(
+        tuple(pos[d] for d in requires_of[sid] if d in pos and pos[d] < i)
+        for i, sid in enumerate(order)
+    )
+    succ = tuple(tuple(pos[d] for d in graph[sid]) for sid in order)
+    return tuple(pos[sid] for sid, _ in shape), pred, succ, is_chain
+
+
+def _earliest_starts(pred: _Adjacency, dur: List[int]) -> Tuple[List[int], int]:
+    """Forward sweep over steps numbered in topological order: a step starts when its
+    last prerequisite ends. Returns the earliest starts and the makespan."""
+    n = len(dur)
+    es = [0] * n
+    ef = [0] * n
+    get = ef.__getitem__
+    total = 0  # makespan: the latest end seen so far
+    for i in range(n):
+        es[i] = start = max(map(get, pred[i]), default=0)
+        ef[i] = end = start + dur[i]
+        if end > total:
+            total = end
+    return es, total
+
+
+def _latest_starts(succ: Sequence[Sequence[int]], dur: List[int], total: int) -> List[int]:
+    """Backward (critical-path) sweep over steps numbered in topological order.
+
+    ``succ[i]`` lists the positions of step ``i``'s dependents and ``dur[i]`` its
+    duration. Plain integer lists in, plain integer list out — no model objects.
+    """
+    # Seeding with total tolerates a dependency cycle, where a successor may not yet
+    # have a computed latest_start when we reach this node in reverse order.
+    ls = [total] * len(dur)
+    get = ls.__getitem__
+    for i in range(len(dur) - 1, -1, -1):  # successors before their predecessors
+        ls[i] = min(map(get, succ[i]), default=total) - dur[i]
+    return ls
 
 
 def _is_passive(step: RecipeStep) -> bool:
     text = f"{step.label} {step.raw_text} {step.notes}".lower()
-    return any(p in text for p in PASSIVE_PHRASES)
+    return _PASSIVE_RE.search(text) is not None
 
 
-def _active_time(scheduled: List[ScheduledStep], passive_ids: set) -> int:
+def _active_time(intervals: List[Tuple[int, int]]) -> int:
     """Total wall-clock time the cook is actively engaged = union of non-passive
-    step intervals (passive waiting doesn't count, but active prep during a bake does)."""
-    intervals = sorted((s.start_min, s.end_min) for s in scheduled if s.id not in passive_ids)
+    step intervals (passive waiting doesn't count, but active prep during a bake does).
+    ``intervals`` is sorted in place."""
+    intervals.sort()
     if not intervals:
         return 0
     merged = [list(intervals[0])]
@@ -89,64 +178,56 @@ def schedule_recipe(recipe: ParsedRecipe) -> ScheduledRecipe:
     if not steps:
         return ScheduledRecipe(**base, steps=[], total_time_min=0, active_time_min=0)
 
-    lookup = {s.id: s for s in steps}
-    order = _topological_order(steps)
-    dur = {s.id: max(1, s.estimated_duration_minutes) for s in steps}
-
-    # Forward pass: earliest start = max end of prerequisites; end = start + duration.
-    start: Dict[str, int] = {}
-    end: Dict[str, int] = {}
-    for sid in order:
-        s = lookup[sid]
-        est = 0
-        for dep in s.requires:
-            if dep in end:  # dep already scheduled (guaranteed unless a cycle)
-                est = max(est, end[dep])
-        start[sid] = est
-        end[sid] = est + dur[sid]
-
-    total = max(end.values())
+    at, pred, succ, is_chain = _SINGLE_STEP if len(steps) == 1 else _build_and_sort(steps)
+    # dur[i] is the duration of the step at topological position i (from the cached graph).
+    dur = [0] * len(pred)
+    for s, i in zip(steps, at):
+        dur[i] = max(1, s.estimated_duration_minutes)
 
+    earliest, total = _earliest_starts(pred, dur)
     # Backward pass (critical path): latest times without delaying the makespan.
-    dependents: Dict[str, List[str]] = {s.id: [] for s in steps}
-    for s in steps:
-        for dep in s.requires:
-            if dep in dependents and dep != s.id:
-                dependents[dep].append(s.id)
-
-    latest_start: Dict[str, int] = {}
-    latest_end: Dict[str, int] = {}
-    for sid in reversed(order):  # successors processed before their predecessors
-        succ = dependents[sid]
-        # .get(..., total) tolerates a dependency cycle, where a successor may not yet
-        # have a computed latest_start when we reach this node in reverse order.
-        le = min((latest_start.get(d, total) for d in succ), default=total)
-        latest_end[sid] = le
-        latest_start[sid] = le - dur[sid]
-
-    passive_ids = {s.id for s in steps if _is_passive(s)}
+    # Only latest_start is stored; latest_end is always latest_start + duration.
+    if is_chain:  # the common linear recipe: every step is critical, latest == earliest
+        latest = earliest
+    else:
+        latest = _latest_starts(succ, dur, total)
 
     scheduled: List[ScheduledStep] = []
-    for s in steps:  # preserve input order; the site sorts by start_min for display
-        slack = max(0, latest_start[s.id] - start[s.id])
+    active: List[Tuple[int, int]] = []
+    # A chain's steps run back to back, so its active intervals never overlap and their
+    # union is just the sum of their lengths (unless duplicate ids share a slot).
+    disjoint = is_chain and len(steps) == len(dur)
+    active_total = 0
+    for s, i in zip(steps, at):  # preserve input order; the site sorts by start_min
+        d, es, ls = dur[i], earliest[i], latest[i]
+        ef = es + d
+        slack = max(0, ls - es)
+        if not _is_passive(s):
+            if disjoint:
+                active_total += d
+            else:
+                active.append((es, ef))
+        # Every value comes from an already-validated RecipeStep or is a computed int, so
+        # skip re-validation. The lists are shared with the input step, not copied; no
+        # stage mutates them in place.
         scheduled.append(
-            ScheduledStep(
+            ScheduledStep.model_construct(
                 id=s.id,
                 raw_text=s.raw_text,
                 label=s.label,
                 type=s.type,
-                duration_min=dur[s.id],
-                start_min=start[s.id],
-                end_min=end[s.id],
-                requires=list(s.requires),
-                can_overlap_with=list(s.can_overlap_with),
-                equipment=list(s.equipment),
+                duration_min=d,
+                start_min=es,
+                end_min=ef,
+                requires=s.requires,
+                can_overlap_with=s.can_overlap_with,
+                equipment=s.equipment,
                 temperature_c=s.temperature_c,
                 notes=s.notes,
                 is_critical=slack == 0,
                 slack_min=slack,
-                latest_start_min=latest_start[s.id],
-                latest_end_min=latest_end[s.id],
+                latest_start_min=ls,
+                latest_end_min=ls + d,
             )
         )
 
@@ -154,10 +235,17 @@ def schedule_recipe(recipe: ParsedRecipe) -> ScheduledRecipe:
         **base,
         steps=scheduled,
         total_time_min=total,
-        active_time_min=_active_time(scheduled, passive_ids),
+        active_time_min=active_total if disjoint else _active_time(active),
     )
 
 
-def schedule_all(recipes: List[ParsedRecipe]) -> List[ScheduledRecipe]:
-    """Schedule every recipe."""
-    return [schedule_recipe(r) for r in recipes]
+def schedule_all(recipes: List[ParsedRecipe], workers: int = 1) -> List[ScheduledRecipe]:
+    """Schedule every recipe, in input order.
+
+    Recipes are independent, so ``workers > 1`` fans them out over a process pool. Each
+    recipe is only milliseconds of work, so this pays off for large batches only.
+    """
+    if workers <= 1 or len(recipes) < 2:
+        return [schedule_recipe(r) for r in recipes]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(schedule_recipe, recipes, chunksize=16))
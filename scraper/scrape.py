@@ -4,28 +4,119 @@ Planthood Recipe Scraper
 Fetches recipe and instruction pages from planthood.co.uk and extracts structured data.
 """
 
-import json
+import math
 import os
 import re
+import threading
 import time
-from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import List, Optional, Dict
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 from dotenv import load_dotenv
+from pydantic_core import from_json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from planthood.io import Cache, content_hash, read_json, write_json
 from planthood.text import node_text
 
 load_dotenv()
 
 # Configuration
 USER_AGENT = os.getenv("USER_AGENT", "Mozilla/5.0 (compatible; PlanthoodScraper/1.0)")
-REQUEST_DELAY = float(os.getenv("REQUEST_DELAY", "1.0"))
+REQUEST_DELAY = float(os.getenv("REQUEST_DELAY", "1.0"))  # average seconds between requests
+REQUEST_BURST = int(os.getenv("REQUEST_BURST", "5"))  # requests allowed back to back
+SCRAPE_WORKERS = int(os.getenv("SCRAPE_WORKERS", "8"))
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
-
-
-@dataclass
+# Opt-in page cache for repeated local runs (e.g. after resetting raw_recipes.json): page
+# bodies are kept under HTTP_CACHE_DIR and revalidated with conditional GETs. Off by default,
+# since normal runs only fetch pages not already in raw_recipes.json.
+HTTP_CACHE = os.getenv("HTTP_CACHE", "").lower() in ("1", "true", "yes")
+HTTP_CACHE_DIR = os.path.join(DATA_DIR, ".cache", "http")
+
+# Patterns for the delivery week printed on a recipe page, tried in order
+WEEK_PATTERNS = [
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        r"(?:MENU|Delivery)\s*(?:\||w/c)\s*(?:DELIVERED\s*)?([A-Z][a-z]+\s+\d{1,2}(?:st|nd|rd|th)?\s*[A-Z][a-z]+\s*\d{4})",
+        r"(?:Week of|w/c)\s+(\d{1,2}/\d{1,2}/\d{4})",
+    )
+]
+# One named group per nutrient; whichever group matched names the value found.
+# Key order is the order nutrition dicts are saved in.
+NUTRITION_KEYS = ("calories", "protein_g", "fat_g", "carbs_g", "fibre_g", "salt_g")
+NUTRITION_RX = re.compile(
+    r"(?P<calories>\d+)\s*kcal"
+    r"|Protein[:\s]*(?P<protein_g>\d+\.?\d*)g"
+    r"|Fat[:\s]*(?P<fat_g>\d+\.?\d*)g"
+    r"|Carb(?:ohydrate)?s?[:\s]*(?P<carbs_g>\d+\.?\d*)g"
+    r"|Fibre[:\s]*(?P<fibre_g>\d+\.?\d*)g"
+    r"|Salt[:\s]*(?P<salt_g>\d+\.?\d*)g",
+    re.IGNORECASE,
+)
+# Checked in this order; the first one mentioned anywhere on the page wins
+CATEGORIES = ("Detox", "Nourish", "Feast", "Cleanse")
+# Header tags searched when a page has no ingredient/method container
+HEADER_TAGS = ["h2", "h3", "strong"]
+# Class-name matchers for bs4 (a compiled pattern is searched against each class)
+INGREDIENT_CLASS_RX = re.compile("ingredient", re.IGNORECASE)
+METHOD_CLASS_RX = re.compile("method|instruction", re.IGNORECASE)
+METHOD_HEADER_RX = re.compile("method|instruction|how to", re.IGNORECASE)
+# Non-recipe product handles to filter out (matched case-insensitively)
+NON_RECIPE_HANDLES = (
+    "monday-deliveries",
+    "thursday-deliveries",
+    "gift-card",
+    "weekend-box",
+    "subscription",
+    "delivery",
+)
+NON_RECIPE_HANDLE_RX = re.compile("|".join(map(re.escape, NON_RECIPE_HANDLES)), re.IGNORECASE)
+
+
+class TokenBucket:
+    """Thread-safe rate limiter: allows bursts of up to ``capacity`` requests while
+    holding the long-run average to ``rate`` requests per second"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)  # below one token, acquire() could never succeed
+        self.tokens = float(self.capacity)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent"""
+        if math.isinf(self.rate):
+            return
+        # Waiting while holding the lock queues the callers behind each other
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                time.sleep((1 - self.tokens) / self.rate)
+
+
+def make_session() -> requests.Session:
+    """HTTP session shared by the scrapers: keep-alive connections pooled per
+    host, and retry with backoff on transient errors"""
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@dataclass(slots=True)
 class Recipe:
     """Structured recipe data"""
 
@@ -33,19 +124,11 @@ class Recipe:
     title: str
     source_url: str
     week_label: Optional[str] = None
-    weeks: List[str] = None  # List of weeks this recipe appears in
+    weeks: List[str] = field(default_factory=list)  # List of weeks this recipe appears in
     category: Optional[str] = None
-    ingredients: List[str] = None
+    ingredients: List[str] = field(default_factory=list)
     method: str = ""
-    nutrition: Optional[Dict[str, float]] = None
-
-    def __post_init__(self):
-        if self.ingredients is None:
-            self.ingredients = []
-        if self.nutrition is None:
-            self.nutrition = {}
-        if self.weeks is None:
-            self.weeks = []
+    nutrition: Dict[str, float] = field(default_factory=dict)
 
 
 class PlanthoodScraper:
@@ -55,8 +138,11 @@ class PlanthoodScraper:
     COOKING_INSTRUCTIONS_URL = f"{BASE_URL}/collections/cooking-instructions"
 
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": USER_AGENT})
+        self.session = make_session()
+        rate = 1 / REQUEST_DELAY if REQUEST_DELAY > 0 else math.inf
+        self.rate_limiter = TokenBucket(rate, REQUEST_BURST)
+        # Page bodies + validators, so re-runs can send conditional GETs (HTTP_CACHE=1)
+        self.http_cache = Cache(HTTP_CACHE_DIR, enabled=HTTP_CACHE)
         self.visited_urls = set()
         self.failed_urls: Dict[str, str] = {}  # url -> error message
 
@@ -67,30 +153,59 @@ class PlanthoodScraper:
 
         try:
             print(f"Fetching: {url}")
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
+            html = self._get_html(url)
             self.visited_urls.add(url)
-            time.sleep(REQUEST_DELAY)
-            return BeautifulSoup(response.text, "lxml")
+            return BeautifulSoup(html, "lxml")
         except Exception as e:
             print(f"Error fetching {url}: {e}")
             return None
 
+    def _get_html(self, url: str) -> str:
+        """GET a page, revalidating any cached copy: an unchanged page comes back as an
+        empty 304 and the cached body is reused"""
+        key = content_hash(url)
+        cached = self.http_cache.get(key)
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        self.rate_limiter.acquire()
+        response = self.session.get(url, timeout=30, headers=headers)
+        if response.status_code == 304 and cached:
+            return cached["body"]
+        response.raise_for_status()
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self.http_cache.set(
+                key, {"etag": etag, "last_modified": last_modified, "body": response.text}
+            )
+        return response.text
+
     def _fetch_products_page(self, page: int, limit: int = 250) -> Optional[List[Dict]]:
-        """Fetch a single page of products from Shopify API"""
+        """Fetch a single page of products from Shopify API.
+
+        Only each product's handle and title are kept, so the variants, images and body
+        HTML of up to 250 products are released as soon as the page is read.
+        """
         url = f"{self.BASE_URL}/products.json?page={page}&limit={limit}"
         print(f"Fetching page {page}...")
 
         try:
+            self.rate_limiter.acquire()
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
-            data = response.json()
-            return data.get("products", [])
+            products = from_json(response.content).get("products", [])
+            return [{"handle": p.get("handle", ""), "title": p.get("title", "")} for p in products]
         except Exception as e:
             print(f"Error fetching page {page}: {e}")
             return None
 
-    def _paginate_products(self, max_pages: int = 50, products_per_page: int = 250):
+    def paginate_products(self, max_pages: int = 50, products_per_page: int = 250):
         """Generator that yields all products from paginated Shopify API"""
         for page in range(1, max_pages + 1):
             products = self._fetch_products_page(page, products_per_page)
@@ -109,31 +224,19 @@ class PlanthoodScraper:
                 print(f"Last page reached ({len(products)} < {products_per_page})")
                 break
 
-            time.sleep(REQUEST_DELAY)
-
     def discover_recipe_urls(self) -> List[str]:
         """Discover recipe URLs using Shopify's products.json API with pagination"""
         recipe_urls = set()
 
-        # Non-recipe product patterns to filter out
-        exclude_patterns = [
-            "monday-deliveries",
-            "thursday-deliveries",
-            "gift-card",
-            "weekend-box",
-            "subscription",
-            "delivery",
-        ]
-
         print("Discovering recipes via Shopify API...")
 
-        for page, products in self._paginate_products():
+        for page, products in self.paginate_products():
             found_on_page = 0
             for product in products:
                 handle = product.get("handle", "")
 
                 # Skip non-recipe products
-                if any(pattern in handle.lower() for pattern in exclude_patterns):
+                if NON_RECIPE_HANDLE_RX.search(handle):
                     continue
 
                 # Build product URL
@@ -150,17 +253,18 @@ class PlanthoodScraper:
         print(f"\nTotal discovered: {len(recipe_urls)} recipe URLs")
         return sorted(list(recipe_urls))
 
-    def _extract_method_from_headers(self, soup: BeautifulSoup) -> str:
+    def _extract_method_from_headers(self, headers: List[Tag]) -> str:
         """Extract method text by finding method/instruction headers"""
-        for header in soup.find_all(["h2", "h3", "strong"]):
-            header_text = header.get_text().lower()
-            if not any(keyword in header_text for keyword in ["method", "instruction", "how to"]):
+        for header in headers:
+            if not METHOD_HEADER_RX.search(header.get_text()):
                 continue
 
-            # Get the next sibling(s) until next header
+            # Walk the following siblings lazily, stopping at the next header
             method_parts = []
-            for sibling in header.find_next_siblings():
-                if sibling.name in ["h2", "h3"]:
+            for sibling in header.next_siblings:
+                if not isinstance(sibling, Tag):  # skip bare text between elements
+                    continue
+                if sibling.name in ("h2", "h3"):
                     break
                 text = node_text(sibling)
                 if text:
@@ -189,34 +293,25 @@ class PlanthoodScraper:
 
             # Extract week label (if present in product description or tags)
             week_label = None
-            week_patterns = [
-                r"(?:MENU|Delivery)\s*(?:\||w/c)\s*(?:DELIVERED\s*)?([A-Z][a-z]+\s+\d{1,2}(?:st|nd|rd|th)?\s*[A-Z][a-z]+\s*\d{4})",
-                r"(?:Week of|w/c)\s+(\d{1,2}/\d{1,2}/\d{4})",
-            ]
             page_text = soup.get_text()
-            for pattern in week_patterns:
-                match = re.search(pattern, page_text, re.IGNORECASE)
+            for rx in WEEK_PATTERNS:
+                match = rx.search(page_text)
                 if match:
                     week_label = match.group(1) if match.lastindex else match.group(0)
                     break
 
             # Extract category (Detox/Nourish/Feast) if mentioned
-            category = None
-            for cat in ["Detox", "Nourish", "Feast", "Cleanse"]:
-                if cat.lower() in page_text.lower():
-                    category = cat
-                    break
+            page_lower = page_text.lower()
+            category = next((cat for cat in CATEGORIES if cat.lower() in page_lower), None)
 
             # Extract ingredients
             ingredients = []
-            ingredients_section = (
-                soup.find(["div", "section"], class_=lambda x: x and "ingredient" in x.lower())
-                if soup
-                else None
-            )
+            headers: Optional[List[Tag]] = None  # found once, shared by both header fallbacks
+            ingredients_section = soup.find(["div", "section"], class_=INGREDIENT_CLASS_RX)
             if not ingredients_section:
                 # Try alternative selectors
-                for header in soup.find_all(["h2", "h3", "strong"]):
+                headers = soup.find_all(HEADER_TAGS)
+                for header in headers:
                     if "ingredient" in header.get_text().lower():
                         ingredients_section = header.find_next(["ul", "div"])
                         break
@@ -229,35 +324,24 @@ class PlanthoodScraper:
 
             # Extract method/instructions
             method = ""
-            method_section = soup.find(
-                ["div", "section"],
-                class_=lambda x: x
-                and ("method" in str(x).lower() or "instruction" in str(x).lower()),
-            )
+            method_section = soup.find(["div", "section"], class_=METHOD_CLASS_RX)
             if method_section:
                 method = node_text(method_section)
             else:
                 # Try finding by header
-                method = self._extract_method_from_headers(soup)
+                if headers is None:
+                    headers = soup.find_all(HEADER_TAGS)
+                method = self._extract_method_from_headers(headers)
 
             # Extract nutrition info
-            nutrition = {}
-            nutrition_patterns = {
-                "calories": r"(\d+)\s*kcal",
-                "protein_g": r"Protein[:\s]*(\d+\.?\d*)g",
-                "fat_g": r"Fat[:\s]*(\d+\.?\d*)g",
-                "carbs_g": r"Carb(?:ohydrate)?s?[:\s]*(\d+\.?\d*)g",
-                "fibre_g": r"Fibre[:\s]*(\d+\.?\d*)g",
-                "salt_g": r"Salt[:\s]*(\d+\.?\d*)g",
-            }
-
-            for key, pattern in nutrition_patterns.items():
-                match = re.search(pattern, page_text, re.IGNORECASE)
-                if match:
-                    try:
-                        nutrition[key] = float(match.group(1))
-                    except ValueError:
-                        pass
+            found: Dict[str, float] = {}
+            for match in NUTRITION_RX.finditer(page_text):
+                key = match.lastgroup
+                if key not in found:  # the first mention of each nutrient wins
+                    found[key] = float(match.group(key))
+                    if len(found) == len(NUTRITION_KEYS):
+                        break
+            nutrition = {key: found[key] for key in NUTRITION_KEYS if key in found}
 
             recipe = Recipe(
                 id=recipe_id,
@@ -267,7 +351,7 @@ class PlanthoodScraper:
                 category=category,
                 ingredients=ingredients,
                 method=method,
-                nutrition=nutrition if nutrition else None,
+                nutrition=nutrition,
             )
 
             print(f"Extracted recipe: {title}")
@@ -286,8 +370,7 @@ class PlanthoodScraper:
         weekly_schedule = {}
         if os.path.exists(weekly_schedule_path):
             try:
-                with open(weekly_schedule_path, "r", encoding="utf-8") as f:
-                    weekly_schedule = json.load(f)
+                weekly_schedule = read_json(weekly_schedule_path)
                 print(f"Loaded weekly schedule with {len(weekly_schedule)} weeks")
             except Exception as e:
                 print(f"Warning: Could not load weekly schedule: {e}")
@@ -313,14 +396,13 @@ class PlanthoodScraper:
         recipe_urls = set(self.discover_recipe_urls())
 
         # Add URLs from schedule that might have been missed
-        for url in url_to_weeks:
-            recipe_urls.add(url)
-
-        recipe_urls = sorted(list(recipe_urls))
+        recipe_urls.update(url_to_weeks)
 
-        # Separate new and existing URLs
-        new_urls = [url for url in recipe_urls if url not in existing_by_url]
-        existing_urls = [url for url in recipe_urls if url in existing_by_url]
+        # Separate new and existing URLs (sorted for a stable output order)
+        new_urls: List[str] = []
+        existing_urls: List[str] = []
+        for url in sorted(recipe_urls):
+            (existing_urls if url in existing_by_url else new_urls).append(url)
 
         print("\nRecipe summary:")
         print(f"  Total discovered: {len(recipe_urls)}")
@@ -345,21 +427,23 @@ class PlanthoodScraper:
                 week_label=recipe_data.get("week_label"),
                 weeks=weeks,  # Use fresh weeks data
                 category=recipe_data.get("category"),
-                ingredients=recipe_data.get("ingredients", []),
+                ingredients=recipe_data.get("ingredients") or [],
                 method=recipe_data.get("method", ""),
-                nutrition=recipe_data.get("nutrition"),
+                nutrition=recipe_data.get("nutrition") or {},
             )
             recipes.append(recipe)
 
-        # Scrape new recipes
+        # Scrape new recipes. Pages are independent, so fetch them concurrently; the
+        # shared rate limiter keeps the average request rate polite.
         print(f"\nScraping {len(new_urls)} new recipes...")
-        for i, url in enumerate(new_urls, 1):
-            print(f"[{i}/{len(new_urls)}] ", end="")
-            recipe = self.extract_recipe(url)
-            if recipe:
-                # Add weeks info
-                recipe.weeks = url_to_weeks.get(url, [])
-                recipes.append(recipe)
+        with ThreadPoolExecutor(max_workers=SCRAPE_WORKERS) as pool:
+            scraped = pool.map(self.extract_recipe, new_urls)  # results in URL order
+            for i, (url, recipe) in enumerate(zip(new_urls, scraped), 1):
+                print(f"[{i}/{len(new_urls)}] {url}: {'ok' if recipe else 'failed'}")
+                if recipe:
+                    # Add weeks info
+                    recipe.weeks = url_to_weeks.get(url, [])
+                    recipes.append(recipe)
 
         return recipes
 
@@ -379,8 +463,7 @@ def main():
     existing_recipes = None
     if os.path.exists(output_path):
         try:
-            with open(output_path, "r", encoding="utf-8") as f:
-                existing_recipes = json.load(f)
+            existing_recipes = read_json(output_path)
             print(f"Found existing recipes file with {len(existing_recipes)} recipes\n")
         except Exception as e:
             print(f"Warning: Could not load existing recipes: {e}\n")
@@ -389,10 +472,10 @@ def main():
     scraper = PlanthoodScraper()
     recipes = scraper.scrape_all(existing_recipes)
 
-    # Save recipes to JSON
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump([asdict(r) for r in recipes], f, indent=2, ensure_ascii=False)
-        f.write("\n")
+    # Save recipes first: the manifest marks URLs as scraped, so it is only written once
+    # the recipes it describes are safely on disk
+    if not write_json(output_path, recipes):
+        print(f"\n{output_path} is unchanged; not rewritten")
 
     # Save manifest tracking all URLs and their status
     manifest = {
@@ -412,9 +495,7 @@ def main():
         "failed_urls": [{"url": url, "error": error} for url, error in scraper.failed_urls.items()],
     }
     try:
-        with open(manifest_path, "w", encoding="utf-8") as f:
-            json.dump(manifest, f, indent=2, ensure_ascii=False)
-            f.write("\n")
+        write_json(manifest_path, manifest)
     except Exception as e:
         print(f"\nWarning: Failed to write manifest file: {e}")
         print(f"Recipe data was saved to {output_path}, but manifest tracking may be incomplete.")
@@ -1,55 +1,79 @@
 import json
 import os
-import time
 from typing import Dict
-import requests
 from playwright.sync_api import sync_playwright
 
+from scrape import PlanthoodScraper  # sibling module: both run as scripts from scraper/
+
 # Configuration
 BASE_URL = "https://planthood.co.uk"
 COOKING_INSTRUCTIONS_URL = f"{BASE_URL}/collections/cooking-instructions"
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
 OUTPUT_FILE = os.path.join(DATA_DIR, "weekly_schedule.json")
+WEEK_CHANGE_TIMEOUT_MS = 10000
+WEEK_SAME_MENU_MS = 3000  # unchanged titles for this long means the same menu
+
+# Recipe titles currently visible in the product grid (h3 tags inside product cards)
+VISIBLE_TITLES_JS = """
+() => Array.from(document.querySelectorAll('.product-card h3, .card-v3__title'))
+    .filter(el => el.offsetParent !== null)  // visible only
+    .map(el => el.textContent.trim())
+"""
+
+# Select each enabled week option in turn and collect its visible titles. After each
+# change, poll the grid until it settles: a new, non-empty title list that holds steady for
+# a few polls, or titles unchanged from the last week for sameMenuMs (the same menu).
+# An empty grid counts as still loading. After timeoutMs the week is returned
+# as shown, flagged unsettled.
+ALL_WEEKS_JS = (
+    """
+async ([selector, timeoutMs, sameMenuMs]) => {
+    const select = document.querySelector(selector);
+    const visibleTitles = %s;
+    const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+    const POLL_MS = 100;
+    const weeks = [];
+    for (const opt of Array.from(select.options).filter(o => o.value && !o.disabled)) {
+        const before = JSON.stringify(visibleTitles());
+        select.value = opt.value;
+        select.dispatchEvent(new Event("input", { bubbles: true }));
+        select.dispatchEvent(new Event("change", { bubbles: true }));
+        let last = before;
+        let stable = 0;
+        let settled = false;
+        for (const end = Date.now() + timeoutMs; !settled && Date.now() < end; ) {
+            await sleep(POLL_MS);
+            const titles = visibleTitles();
+            const now = JSON.stringify(titles);
+            stable = now === last ? stable + 1 : 0;
+            last = now;
+            if (titles.length === 0) continue;  // cleared while the new week loads
+            settled = now !== before ? stable >= 3 : stable * POLL_MS >= sameMenuMs;
+        }
+        weeks.push({ label: opt.text.trim(), titles: visibleTitles(), settled });
+    }
+    return weeks;
+}
+"""
+    % VISIBLE_TITLES_JS
+)
 
 
 def fetch_product_map() -> Dict[str, str]:
     """
-    Fetch all products from Shopify API and create a map of Title -> URL.
+    Fetch all products from Shopify API and create a map of casefolded title -> URL.
     This is needed because the week view only shows titles, but we need URLs.
     """
     print("Fetching product map from Shopify API...")
     title_to_url = {}
-    page = 1
-    limit = 250
-
-    while True:
-        try:
-            url = f"{BASE_URL}/products.json?limit={limit}&page={page}"
-            print(f"  Fetching page {page}...")
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-
-            products = data.get("products", [])
-            if not products:
-                break
-
-            for product in products:
-                title = product.get("title", "").strip()
-                handle = product.get("handle", "")
-                if title and handle:
-                    # Normalize title for better matching
-                    title_to_url[title] = f"{BASE_URL}/products/{handle}"
-                    # Also store lowercase version
-                    title_to_url[title.lower()] = f"{BASE_URL}/products/{handle}"
-
-            if len(products) < limit:
-                break
-            page += 1
-
-        except Exception as e:
-            print(f"Error fetching products page {page}: {e}")
-            break
+    # Same paginated (and rate-limited, pooled) products.json walk as recipe discovery
+    for _page, products in PlanthoodScraper().paginate_products():
+        for product in products:
+            title = product.get("title", "").strip()
+            handle = product.get("handle", "")
+            if title and handle:
+                # Keyed case-insensitively; look up with title.casefold()
+                title_to_url[title.casefold()] = f"{BASE_URL}/products/{handle}"
 
     print(f"Mapped {len(title_to_url)} product titles to URLs")
     return title_to_url
@@ -98,70 +122,40 @@ def scrape_weeks():
                 f.write(page.content())
             raise
 
-        # Get all options
-        options = page.eval_on_selector(
-            select_selector,
-            """
-            (select) => Array.from(select.options)
-                .filter(opt => opt.value && opt.value !== "" && !opt.disabled)
-                .map(opt => ({ text: opt.text.trim(), value: opt.value }))
-        """,
+        # ALL_WEEKS_JS selects each week in the browser and returns every week's titles
+        weeks = page.evaluate(
+            ALL_WEEKS_JS, [select_selector, WEEK_CHANGE_TIMEOUT_MS, WEEK_SAME_MENU_MS]
         )
+        browser.close()
 
-        print(f"Found {len(options)} week options")
-
-        weekly_schedule = {}
-
-        for i, option in enumerate(options):
-            week_label = option["text"]
-            value = option["value"]
-            print(f"[{i + 1}/{len(options)}] Processing week: {week_label} (value: {value})")
-
-            # Select the option
-            page.select_option(select_selector, value)
-
-            # Wait for the content to update.
-            time.sleep(3)
-
-            # Extract recipe titles visible on the page
-            # We look for h3 tags inside product cards or similar
-            titles = page.evaluate("""
-                () => {
-                    const titles = [];
-                    // Selector for titles in the grid
-                    document.querySelectorAll('.product-card h3, .card-v3__title').forEach(el => {
-                        if (el.offsetParent !== null) { // Check visibility
-                            titles.push(el.textContent.trim());
-                        }
-                    });
-                    return titles;
-                }
-            """)
-
-            # Map titles to URLs
-            week_urls = []
-            for title in titles:
-                # Try exact match
-                url = title_to_url.get(title)
-                if not url:
-                    # Try case-insensitive
-                    url = title_to_url.get(title.lower())
-
-                if url:
-                    week_urls.append(url)
-                else:
-                    print(f"  Warning: Could not find URL for recipe '{title}'")
-
-            # Remove duplicates
-            week_urls = sorted(list(set(week_urls)))
-
-            if week_urls:
-                weekly_schedule[week_label] = week_urls
-                print(f"  Found {len(week_urls)} recipes")
+    print(f"Found {len(weeks)} week options")
+
+    weekly_schedule = {}
+
+    for i, week in enumerate(weeks):
+        week_label = week["label"]
+        print(f"[{i + 1}/{len(weeks)}] Processing week: {week_label}")
+        if not week["settled"]:
+            print("  Warning: recipe grid did not settle in time; titles may be incomplete")
+
+        # Map titles to URLs
+        week_urls = []
+        for title in week["titles"]:
+            url = title_to_url.get(title.casefold())
+
+            if url:
+                week_urls.append(url)
             else:
-                print("  No recipes found for this week")
+                print(f"  Warning: Could not find URL for recipe '{title}'")
 
-        browser.close()
+        # Remove duplicates
+        week_urls = sorted(list(set(week_urls)))
+
+        if week_urls:
+            weekly_schedule[week_label] = week_urls
+            print(f"  Found {len(week_urls)} recipes")
+        else:
+            print("  No recipes found for this week")
 
     # Save to file
     print(f"Saving schedule to {OUTPUT_FILE}...")
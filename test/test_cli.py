@@ -0,0 +1,38 @@
+"""Tests for CLI helpers."""
+
+import pytest
+
+from planthood.cli import _resolve_id
+
+IDS = ["lentil-dal", "red-lentil-soup", "green-curry", "thai-green-curry", "pesto-pasta"]
+
+
+def test_resolve_id_exact_match_wins_over_substrings():
+    assert _resolve_id("green-curry", IDS) == "green-curry"
+
+
+def test_resolve_id_unique_substring_is_case_insensitive():
+    assert _resolve_id("PESTO", IDS) == "pesto-pasta"
+
+
+def test_resolve_id_ambiguous_exits_with_suggestions(capsys):
+    with pytest.raises(SystemExit) as exc:
+        _resolve_id("lentil", IDS)
+    assert exc.value.code == 1
+    out = capsys.readouterr().out
+    assert "Recipe 'lentil' not found." in out
+    assert "lentil-dal" in out and "red-lentil-soup" in out
+
+
+def test_resolve_id_suggests_at_most_five(capsys):
+    ids = [f"soup-{i}" for i in range(10)]
+    with pytest.raises(SystemExit):
+        _resolve_id("soup", ids)
+    out = capsys.readouterr().out
+    assert out.count("soup-") == 5
+
+
+def test_resolve_id_no_match_has_no_suggestions(capsys):
+    with pytest.raises(SystemExit):
+        _resolve_id("risotto", IDS)
+    assert "Did you mean" not in capsys.readouterr().out
@@ -75,6 +75,29 @@ def test_invalid_duration_is_repaired():
     assert parsed.steps[0].estimated_duration_minutes >= 1
 
 
+def test_null_dependency_lists_are_treated_as_empty():
+    ex = _extracted(["A.", "B."])
+    provider = FakeProvider(
+        {
+            "steps": [
+                {"id": "step-1", "label": "A", "type": "prep", "estimated_duration_minutes": 2},
+                {
+                    "id": "step-2",
+                    "label": "B",
+                    "type": "cook",
+                    "estimated_duration_minutes": 5,
+                    "requires": None,
+                    "can_overlap_with": None,
+                },
+            ]
+        }
+    )
+    parsed = enrich_recipe(ex, provider=provider)
+    assert parsed.provenance == "llm"  # not a crash into the deterministic fallback
+    assert parsed.steps[1].requires == []
+    assert parsed.steps[1].can_overlap_with == []
+
+
 def test_graph_refs_sanitized():
     ex = _extracted(["A.", "B."])
     provider = FakeProvider(
@@ -243,6 +266,25 @@ def test_limit_caps_llm_enrichments():
     assert calls["n"] == 2  # only 2 recipes hit the LLM
 
 
+def test_concurrent_enrichment_keeps_order_and_limit():
+    exs = [_extracted(["Chop.", "Cook."], id=f"r{i}") for i in range(12)]
+
+    calls = []
+
+    class Recording(LLMProvider):
+        def complete_json(self, system, user, schema):
+            calls.append(user)
+            return {"steps": []}
+
+        @property
+        def name(self):
+            return "recording"
+
+    out = enrich_all(exs, provider=Recording(), limit=5, concurrency=4)
+    assert [r.id for r in out] == [e.id for e in exs]
+    assert len(calls) == 5  # the cap is shared across worker threads
+
+
 def test_circuit_breaker_stops_calling_after_repeated_failures(monkeypatch):
     from planthood.enrich import enricher
 
@@ -354,3 +396,32 @@ def test_paragraph_case_uses_model_segmentation():
     parsed = enrich_recipe(ex, provider=provider)
     assert [s.id for s in parsed.steps] == ["step-1", "step-2"]  # renumbered
     assert parsed.steps[0].raw_text == "Heat oil"
+
+
+def test_llm_results_are_checkpointed_as_they_arrive(tmp_path):
+    from planthood import io
+    from planthood.models import ParsedRecipe
+
+    exs = [_extracted(["Chop.", "Cook."], id=f"r{i}") for i in range(3)]
+    exs.append(_extracted(["Unwrap."], id="bundle", cookable=False))
+    path = tmp_path / "partial.jsonl"
+    out = enrich_all(
+        exs,
+        provider=FakeProvider({"steps": []}),  # non-mock name → 'llm' provenance
+        on_enriched=lambda r: io.append_jsonl(path, r),
+    )
+    with open(path, "ab") as f:
+        f.write(b'{"id": "cut-off')  # a crash mid-append leaves a partial line
+
+    saved = io.load_jsonl(path, ParsedRecipe)
+    assert [r.id for r in saved] == ["r0", "r1", "r2"]  # no LLM call for the bundle
+    assert saved == [r for r in out if r.provenance == "llm"]
+
+
+def test_checkpoint_failure_does_not_abort_the_batch():
+    def full_disk(_recipe):
+        raise OSError(28, "No space left on device")
+
+    exs = [_extracted(["Chop.", "Cook."], id=f"r{i}") for i in range(3)]
+    out = enrich_all(exs, provider=FakeProvider({"steps": []}), on_enriched=full_disk)
+    assert [r.provenance for r in out] == ["llm"] * 3
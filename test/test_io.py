@@ -0,0 +1,68 @@
+"""Tests for artifact IO helpers."""
+
+import json
+import threading
+
+import pytest
+
+from planthood.io import Cache, index_records, write_bytes_atomic
+
+
+def test_write_bytes_atomic_skips_unchanged_content(tmp_path):
+    path = tmp_path / "out.json"
+    assert write_bytes_atomic(path, b"[1]\n") is True
+    assert write_bytes_atomic(path, b"[1]\n") is False  # same bytes: left alone
+    assert write_bytes_atomic(path, b"[2]\n") is True
+    assert path.read_bytes() == b"[2]\n"
+    assert list(tmp_path.iterdir()) == [path]  # no temp files left behind
+
+
+def test_concurrent_writers_to_one_path_do_not_collide(tmp_path):
+    path = tmp_path / "key.json"
+    payloads = [f'{{"n": {i}}}'.encode() * 1000 for i in range(8)]
+    errors = []
+
+    def write(data):
+        try:
+            write_bytes_atomic(path, data)
+        except Exception as e:  # noqa: BLE001
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(p,)) for p in payloads]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert path.read_bytes() in payloads  # one whole payload, never a mix
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_cache_set_from_many_threads_keeps_a_whole_entry(tmp_path):
+    cache = Cache(tmp_path)
+    values = [{"body": str(i) * 5000} for i in range(8)]
+    threads = [threading.Thread(target=cache.set, args=("k", v)) for v in values]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert cache.get("k") in values
+    assert [p.name for p in tmp_path.iterdir()] == ["k.json"]
+
+
+def test_index_records_keys_rows_by_id(tmp_path):
+    path = tmp_path / "recipes.json"
+    rows = [{"id": "a", "title": "A"}, {"title": "no id"}, "not a record", {"id": "b"}]
+    path.write_text(json.dumps(rows))
+    assert index_records(path) == {"a": {"id": "a", "title": "A"}, "b": {"id": "b"}}
+
+
+def test_index_records_missing_file_is_empty(tmp_path):
+    assert index_records(tmp_path / "missing.json") == {}
+
+
+def test_index_records_rejects_non_array(tmp_path):
+    path = tmp_path / "recipes.json"
+    path.write_text('{"id": "a"}')
+    with pytest.raises(ValueError):
+        index_records(path)
@@ -112,3 +112,17 @@ def test_ungrounded_step_lowers_grounding():
     ]
     report = compute_report(extracted, scheduled, [raw])
     assert report["grounding"] == 0.0
+
+
+def test_cycles_counted_without_recursion_limit():
+    chain = [_scheduled_step("s0", 0, 1)]
+    chain += [_scheduled_step(f"s{i}", i, 1, requires=[f"s{i - 1}"]) for i in range(1, 5000)]
+    looped = [
+        _scheduled_step("a", 0, 1, requires=["b"]),
+        _scheduled_step("b", 1, 1, requires=["a"]),
+    ]
+    scheduled = [
+        ScheduledRecipe(id="long", title="T", steps=chain),
+        ScheduledRecipe(id="loop", title="T", steps=looped),
+    ]
+    assert compute_report([], scheduled, [])["cycles"] == 1
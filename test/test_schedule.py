@@ -1,7 +1,7 @@
 """Unit tests for the scheduler — focused on the invariants the old one violated."""
 
 from planthood.models import ParsedRecipe, RecipeStep
-from planthood.schedule import schedule_recipe
+from planthood.schedule import schedule_all, schedule_recipe
 
 
 def _recipe(steps):
@@ -91,6 +91,23 @@ def test_critical_path_marked():
     assert by_id["step-2"].slack_min > 0
 
 
+def test_linear_chain_is_fully_critical():
+    sched = schedule_recipe(
+        _recipe(
+            [
+                _step("step-1", 5),
+                _step("step-2", 3, requires=["step-1"]),
+                _step("step-3", 4, requires=["step-2"]),
+            ]
+        )
+    )
+    assert sched.total_time_min == 12
+    for s in sched.steps:
+        assert s.is_critical
+        assert s.slack_min == 0
+        assert (s.latest_start_min, s.latest_end_min) == (s.start_min, s.end_min)
+
+
 def test_active_time_excludes_passive_waiting():
     # A 30-min unattended roast should not count as active cooking time.
     sched = schedule_recipe(
@@ -132,3 +149,21 @@ def test_empty_recipe():
     assert sched.steps == []
     assert sched.total_time_min == 0
     assert sched.active_time_min == 0
+
+
+def test_schedule_all_parallel_matches_serial():
+    recipes = [
+        ParsedRecipe(
+            id=f"r{i}",
+            title="T",
+            steps=[
+                _step("step-1", i + 1),
+                _step("step-2", 3, requires=["step-1"]),
+                _step("step-3", 2),
+            ],
+        )
+        for i in range(40)
+    ]
+    serial = schedule_all(recipes)
+    parallel = schedule_all(recipes, workers=2)
+    assert [r.model_dump() for r in parallel] == [r.model_dump() for r in serial]
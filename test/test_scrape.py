@@ -0,0 +1,50 @@
+"""Unit tests for scraper helpers (no network)."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scraper"))
+
+import scrape  # noqa: E402  (scraper/ runs as scripts, not a package)
+from scrape import TokenBucket  # noqa: E402
+
+
+def _fake_clock(monkeypatch):
+    clock = {"now": 0.0}
+    sleeps = []
+
+    def sleep(secs):
+        sleeps.append(secs)
+        clock["now"] += secs
+
+    monkeypatch.setattr(scrape.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(scrape.time, "sleep", sleep)
+    return sleeps
+
+
+def test_token_bucket_allows_a_burst_then_paces(monkeypatch):
+    sleeps = _fake_clock(monkeypatch)
+    bucket = TokenBucket(rate=2, capacity=3)
+    for _ in range(3):
+        bucket.acquire()
+    assert sleeps == []  # the burst goes straight through
+    bucket.acquire()
+    assert sleeps == [0.5]  # then one token per 1/rate seconds
+
+
+def test_token_bucket_capacity_below_one_is_clamped(monkeypatch):
+    sleeps = _fake_clock(monkeypatch)
+    bucket = TokenBucket(rate=1, capacity=0)  # e.g. REQUEST_BURST=0
+    bucket.acquire()
+    bucket.acquire()
+    assert bucket.capacity == 1
+    assert sleeps == [1.0]  # paced, not hung
+
+
+def test_disabled_http_cache_creates_no_directory(monkeypatch, tmp_path):
+    cache_dir = tmp_path / "http"
+    monkeypatch.setattr(scrape, "HTTP_CACHE", False)  # the default
+    monkeypatch.setattr(scrape, "HTTP_CACHE_DIR", str(cache_dir))
+    scraper = scrape.PlanthoodScraper()
+    assert not scraper.http_cache.enabled
+    assert not cache_dir.exists()  # constructing a scraper leaves no directory behind